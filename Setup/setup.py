@@ -5,20 +5,191 @@ Handles virtual environment creation and dependency installation
 """
 
 import os
+import re
 import sys
-import subprocess
-import platform
+import stat
+from collections import deque
+try:
+    from functools import cached_property
+except ImportError:
+    # Python < 3.8; check_python_version rejects it before any property is used
+    cached_property = property
 from pathlib import Path
 
+# Heavier stdlib modules (subprocess, shutil, platform, ...) are imported in
+# the functions that use them, so startup and early exits stay cheap
+
+# Platform layout is fixed for the life of the process, so resolve it once
+_IS_WINDOWS = sys.platform == "win32"
+_SCRIPTS_DIR_REL = Path("Scripts") if _IS_WINDOWS else Path("bin")
+_PY_EXE_REL = _SCRIPTS_DIR_REL / ("python.exe" if _IS_WINDOWS else "python")
+
+# Records which venv a cached environment was copied from, so restores can
+# repoint console script shebangs that still name that venv
+_CACHE_SOURCE_FILE = ".source_venv_path"
+
+# Header pip writes for console scripts whose interpreter path cannot be
+# used in a plain shebang line
+_SH_WRAPPER_RE = re.compile(rb"""#!/bin/sh\n'''exec' "([^"]*)" "\$0" "\$@"\n' '''\n""")
+
+# Read the umask once at import, before any worker threads exist, so files
+# written via a temporary get the permissions a plain open() would give them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Oldest pip accepted without upgrading it first
+_PIP_MIN_VERSION = (24, 0)
+
+def get_cache_root():
+    """Get the per-user cache directory used for prepared environments"""
+    if _IS_WINDOWS:
+        base = os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(base) / "emotion_env"
+
+def run_streamed(command, check=True, echo=True, prefix="", env=None):
+    """Run a command, echoing its output line by line and keeping only the tail
+    
+    Returns a CompletedProcess whose stdout holds the last lines of combined
+    stdout/stderr, so long pip logs are never buffered in full.
+    """
+    import subprocess
+    
+    tail = deque(maxlen=200)
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
+                          text=True, bufsize=1, env=env) as process:
+        for line in process.stdout:
+            if echo:
+                print(f"{prefix}{line}", end="", flush=True)
+            tail.append(line)
+    output = "".join(tail)
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, output=output)
+    return subprocess.CompletedProcess(command, process.returncode, stdout=output)
+
+def write_file_atomic(path, content):
+    """Write a text file via a temporary sibling so readers never see a partial file
+    
+    Returns False without touching the file if it already has this content.
+    """
+    import tempfile
+    
+    path = Path(path)
+    if path.is_file() and path.read_text() == content:
+        return False
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        # mkstemp creates the file owner-only (0600)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+def file_sha256(path):
+    """Hash a file in chunks so large wheels are never read into memory at once"""
+    import hashlib
+    
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def write_wheel_checksums(wheel_dir):
+    """Record the sha256 of every wheel in a directory to SHA256SUMS"""
+    wheel_dir = Path(wheel_dir)
+    lines = [f"{file_sha256(wheel)}  {wheel.name}\n" for wheel in sorted(wheel_dir.glob("*.whl"))]
+    write_file_atomic(wheel_dir / "SHA256SUMS", "".join(lines))
+
+def verify_wheel_checksums(wheel_dir):
+    """Check that a wheel directory matches its SHA256SUMS exactly
+    
+    Any file other than the listed wheels (an sdist, say) fails the check,
+    so nothing unverified can end up being installed from the directory.
+    """
+    wheel_dir = Path(wheel_dir)
+    checksums_file = wheel_dir / "SHA256SUMS"
+    if not checksums_file.exists():
+        return False
+    expected = {}
+    for line in checksums_file.read_text().splitlines():
+        checksum, _, name = line.strip().partition("  ")
+        if name:
+            expected[name] = checksum
+    wheels = {entry.name: entry for entry in wheel_dir.iterdir() if entry.name != "SHA256SUMS"}
+    if not wheels or set(wheels) != set(expected):
+        return False
+    if not all(name.endswith(".whl") and wheel.is_file() for name, wheel in wheels.items()):
+        return False
+    return all(file_sha256(wheels[name]) == checksum for name, checksum in expected.items())
+
+def clone_tree(src, dst):
+    """Copy a directory tree by hard-linking its files where possible
+    
+    Falls back to a reflink (copy-on-write) when the optional reflink package
+    is installed, and to a regular copy otherwise. Hard-linked files share
+    storage with the source, so they must be replaced rather than edited in place.
+    """
+    import shutil
+    try:
+        import reflink
+    except ImportError:
+        reflink = None
+    
+    def link_or_copy(src_file, dst_file):
+        try:
+            os.link(src_file, dst_file)
+            return dst_file
+        except OSError:
+            pass
+        if reflink is not None:
+            try:
+                reflink.reflink(src_file, dst_file)
+                return dst_file
+            except Exception:
+                pass
+        return shutil.copy2(src_file, dst_file)
+    
+    shutil.copytree(src, dst, symlinks=True, copy_function=link_or_copy)
+
+def remove_tree(path):
+    """Delete a directory tree, clearing read-only flags that block removal on Windows"""
+    import shutil
+    
+    def make_writable_and_retry(func, failed_path, _):
+        os.chmod(failed_path, stat.S_IWRITE)
+        func(failed_path)
+    
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=make_writable_and_retry)
+    else:
+        shutil.rmtree(path, onerror=make_writable_and_retry)
+
 class EmotionRecognitionSetup:
-    def __init__(self):
+    def __init__(self, venv_path=None, recreate=False):
         self.project_root = Path.cwd()
-        self.venv_name = "emotion_env"
-        self.venv_path = self.project_root / self.venv_name
-        self.is_windows = platform.system() == "Windows"
+        if venv_path is None:
+            self.venv_path = self.project_root / "emotion_env"
+        else:
+            self.venv_path = Path(venv_path).absolute()
+        self.venv_name = self.venv_path.name
+        self.recreate = recreate
+        self.restored_from_cache = False
+        self.created_venv = False
         
     def print_header(self):
         """Print setup header"""
+        import platform
+        
         print("=" * 60)
         print("🎯 EMOTION RECOGNITION SYSTEM - AUTOMATED SETUP")
         print("=" * 60)
@@ -38,84 +209,541 @@ class EmotionRecognitionSetup:
     
     def create_virtual_environment(self):
         """Create virtual environment"""
+        import subprocess
+        
         print(f"\n📦 Creating virtual environment: {self.venv_name}")
         
         if self.venv_path.exists():
             print(f"⚠️  Virtual environment already exists at {self.venv_path}")
-            response = input("Do you want to recreate it? (y/N): ").strip().lower()
-            if response in ['y', 'yes']:
+            if self.recreate:
                 print("🗑️  Removing existing virtual environment...")
-                if self.is_windows:
-                    subprocess.run(["rmdir", "/s", "/q", str(self.venv_path)], shell=True)
-                else:
-                    subprocess.run(["rm", "-rf", str(self.venv_path)])
+                try:
+                    remove_tree(self.venv_path)
+                except OSError as e:
+                    print(f"❌ Failed to remove existing virtual environment: {e}")
+                    return False
             else:
-                print("✅ Using existing virtual environment")
+                print("✅ Using existing virtual environment (pass --recreate to rebuild it)")
                 return True
         
+        # A requested rebuild must not bring back a cached copy of the old environment
+        if not self.recreate and self.restore_cached_environment():
+            return True
+        
         try:
             print("🔨 Creating new virtual environment...")
-            subprocess.run([sys.executable, "-m", "venv", str(self.venv_path)], 
-                         check=True, capture_output=True, text=True)
+            # Skip ensurepip, which unpacks and installs pip from scratch every time
+            run_streamed([sys.executable, "-m", "venv", "--without-pip", str(self.venv_path)])
+            if not self.install_cached_pip():
+                run_streamed([self.python_exe, "-m", "ensurepip", "--default-pip"])
+            self.created_venv = True
             print("✅ Virtual environment created successfully")
             return True
         except subprocess.CalledProcessError as e:
             print(f"❌ Failed to create virtual environment: {e}")
-            print(f"Error output: {e.stderr}")
             return False
     
-    def get_activation_command(self):
-        """Get the command to activate virtual environment"""
-        if self.is_windows:
-            return str(self.venv_path / "Scripts" / "activate.bat")
+    def get_cache_key(self):
+        """Hash requirements, Python build and platform into a cache key"""
+        import hashlib
+        import sysconfig
+        
+        requirements_file = self.project_root / "requirements.txt"
+        if not requirements_file.exists():
+            return None
+        digest = hashlib.sha256(requirements_file.read_bytes())
+        digest.update(sys.version.encode())
+        # Interpreter ABI and platform tag rather than platform.platform(),
+        # which includes the kernel release and changes on every OS update
+        digest.update(sys.implementation.cache_tag.encode())
+        digest.update(str(sysconfig.get_config_var("EXT_SUFFIX")).encode())
+        digest.update(sysconfig.get_platform().encode())
+        if _IS_WINDOWS:
+            # Console script .exe launchers embed the absolute interpreter path
+            # and cannot be rewritten, so only reuse caches for the same venv
+            digest.update(str(self.venv_path).encode())
+        return digest.hexdigest()
+    
+    def get_cached_environment_path(self):
+        """Get the cached environment matching the current requirements"""
+        key = self.get_cache_key()
+        if key is None:
+            return None
+        return get_cache_root() / key
+    
+    def restore_cached_environment(self):
+        """Materialize a previously prepared environment if one exists"""
+        import shutil
+        import subprocess
+        
+        cache_path = self.get_cached_environment_path()
+        if cache_path is None or not (cache_path / _CACHE_SOURCE_FILE).is_file():
+            return False
+        source_venv_path = (cache_path / _CACHE_SOURCE_FILE).read_text().strip()
+        
+        print(f"♻️  Restoring cached environment from {cache_path}")
+        try:
+            # Installed packages are hard-linked from the cache; scripts and
+            # pyvenv.cfg get real copies because they are rewritten below
+            self.venv_path.mkdir()
+            for entry in cache_path.iterdir():
+                target = self.venv_path / entry.name
+                if entry.name == _CACHE_SOURCE_FILE:
+                    continue
+                elif entry.is_symlink():
+                    os.symlink(os.readlink(entry), target)
+                elif entry.name == _SCRIPTS_DIR_REL.name:
+                    shutil.copytree(entry, target, symlinks=True)
+                elif entry.is_dir():
+                    clone_tree(entry, target)
+                else:
+                    shutil.copy2(entry, target)
+            # Re-run venv over the copy to rewrite pyvenv.cfg and activation scripts
+            run_streamed([sys.executable, "-m", "venv", "--without-pip", str(self.venv_path)])
+            self.rewrite_script_shebangs(source_venv_path)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"⚠️  Warning: Failed to restore cached environment: {e}")
+            shutil.rmtree(self.venv_path, ignore_errors=True)
+            return False
+        
+        self.restored_from_cache = True
+        print("✅ Virtual environment restored from cache")
+        return True
+    
+    def rewrite_script_shebangs(self, old_prefix):
+        """Point console script shebangs at this environment instead of the one cached
+        
+        Handles both plain "#!interpreter" lines and the "#!/bin/sh" wrapper
+        pip writes when the interpreter path has spaces or is too long for a
+        shebang, and picks the right form for the new path.
+        """
+        scripts_dir = self.venv_path / _SCRIPTS_DIR_REL
+        old_prefix = str(old_prefix).encode()
+        new_prefix = str(self.venv_path).encode()
+        for script in scripts_dir.iterdir():
+            if script.is_symlink() or not script.is_file():
+                continue
+            content = script.read_bytes()
+            match = _SH_WRAPPER_RE.match(content)
+            if match:
+                interpreter, rest = match.group(1), content[match.end():]
+            elif content.startswith(b"#!"):
+                first_line, _, rest = content.partition(b"\n")
+                interpreter = first_line[2:].strip()
+            else:
+                continue
+            if not interpreter.startswith(old_prefix):
+                continue
+            interpreter = new_prefix + interpreter[len(old_prefix):]
+            # Same rule pip uses: shebangs are split on spaces and limited
+            # to 127 bytes by the kernel
+            if b" " in interpreter or len(interpreter) + 3 > 127:
+                header = b"#!/bin/sh\n'''exec' \"" + interpreter + b"\" \"$0\" \"$@\"\n' '''\n"
+            else:
+                header = b"#!" + interpreter + b"\n"
+            script.write_bytes(header + rest)
+    
+    def save_environment_to_cache(self):
+        """Store the freshly installed environment for reuse by later runs
+        
+        Only called for environments this run created and verified, so an
+        existing entry for the same key (left by --recreate) is replaced.
+        """
+        import shutil
+        
+        cache_path = self.get_cached_environment_path()
+        if cache_path is None:
+            return
+        
+        print(f"💾 Caching environment at {cache_path}")
+        staging_path = cache_path.with_name(cache_path.name + ".tmp")
+        try:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            shutil.copytree(self.venv_path, staging_path, symlinks=True)
+            (staging_path / _CACHE_SOURCE_FILE).write_text(str(self.venv_path))
+            if cache_path.exists():
+                remove_tree(cache_path)
+            os.replace(staging_path, cache_path)
+            print("✅ Environment cached for future setups")
+        except OSError as e:
+            print(f"⚠️  Warning: Failed to cache environment: {e}")
+            shutil.rmtree(staging_path, ignore_errors=True)
+            return
+        self.prune_cached_environments(keep=cache_path)
+    
+    def prune_cached_environments(self, keep):
+        """Remove older cache entries taken from this venv, superseded by the one kept"""
+        for entry in get_cache_root().iterdir():
+            if entry == keep or not re.fullmatch(r"[0-9a-f]{64}", entry.name):
+                continue
+            source_file = entry / _CACHE_SOURCE_FILE
+            try:
+                if not source_file.is_file() or source_file.read_text().strip() != str(self.venv_path):
+                    continue
+                print(f"🗑️  Pruning stale cached environment at {entry}")
+                remove_tree(entry)
+            except OSError as e:
+                print(f"⚠️  Warning: Failed to prune cached environment {entry}: {e}")
+    
+    def discard_cached_environment(self):
+        """Remove the cache entry for the current key so the next run rebuilds it"""
+        cache_path = self.get_cached_environment_path()
+        if cache_path is None or not cache_path.exists():
+            return
+        print(f"🗑️  Discarding cached environment at {cache_path}")
+        try:
+            remove_tree(cache_path)
+        except OSError as e:
+            print(f"⚠️  Warning: Failed to discard cached environment: {e}")
+    
+    def get_site_packages(self):
+        """Get the site-packages directory of the virtual environment
+        
+        Asks sysconfig rather than assuming lib/pythonX.Y, which is wrong for
+        free-threaded builds (python3.13t) and PyPy.
+        """
+        import sysconfig
+        
+        # The "venv" scheme exists from Python 3.11
+        if "venv" in sysconfig.get_scheme_names():
+            scheme = "venv"
         else:
-            return f"source {self.venv_path}/bin/activate"
+            scheme = "nt" if _IS_WINDOWS else "posix_prefix"
+        venv_vars = {"base": str(self.venv_path), "platbase": str(self.venv_path)}
+        return Path(sysconfig.get_path("purelib", scheme, vars=venv_vars))
+    
+    def get_cached_pip(self):
+        """Extract the pip wheel bundled with ensurepip into the cache once"""
+        import shutil
+        import zipfile
+        
+        try:
+            import ensurepip
+        except ImportError:
+            return None
+        wheels = sorted((Path(ensurepip.__file__).parent / "_bundled").glob("pip-*.whl"))
+        if not wheels:
+            return None
+        
+        pip_cache = get_cache_root() / "pip_wheel" / wheels[-1].stem
+        if not pip_cache.exists():
+            staging_path = pip_cache.with_name(pip_cache.name + ".tmp")
+            shutil.rmtree(staging_path, ignore_errors=True)
+            with zipfile.ZipFile(wheels[-1]) as wheel:
+                wheel.extractall(staging_path)
+            os.replace(staging_path, pip_cache)
+        return pip_cache
     
-    def get_python_executable(self):
-        """Get path to Python executable in virtual environment"""
-        if self.is_windows:
-            return str(self.venv_path / "Scripts" / "python.exe")
+    def install_cached_pip(self):
+        """Copy the cached pip into the virtual environment and add launchers"""
+        import shutil
+        import zipfile
+        
+        try:
+            pip_cache = self.get_cached_pip()
+            if pip_cache is None:
+                return False
+            
+            # Copied rather than symlinked so upgrading pip inside the
+            # environment can never modify the shared cache
+            site_packages = self.get_site_packages()
+            for entry in pip_cache.iterdir():
+                shutil.copytree(entry, site_packages / entry.name)
+            
+            # Same names ensurepip provides: pip, pip3 and pip3.X
+            scripts_dir = self.venv_path / _SCRIPTS_DIR_REL
+            for name in ("pip", f"pip{sys.version_info.major}",
+                         f"pip{sys.version_info.major}.{sys.version_info.minor}"):
+                if _IS_WINDOWS:
+                    launcher = scripts_dir / f"{name}.bat"
+                    launcher.write_text('@"%~dp0python.exe" -m pip %*\r\n')
+                else:
+                    launcher = scripts_dir / name
+                    launcher.write_text('#!/bin/sh\nexec "$(dirname "$0")/python" -m pip "$@"\n')
+                    launcher.chmod(0o755)
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"⚠️  Warning: Failed to install cached pip: {e}")
+            return False
+        return True
+    
+    @cached_property
+    def installer_env(self):
+        """Environment for installer processes that lets source builds use every core"""
+        jobs = str(os.cpu_count() or 1)
+        env = os.environ.copy()
+        env.setdefault("PIP_DISABLE_PIP_VERSION_CHECK", "1")
+        env.setdefault("MAKEFLAGS", f"-j{jobs}")
+        env.setdefault("CMAKE_BUILD_PARALLEL_LEVEL", jobs)
+        env.setdefault("MAX_JOBS", jobs)
+        return env
+    
+    @cached_property
+    def activation_cmd(self):
+        """Command to activate the virtual environment"""
+        if _IS_WINDOWS:
+            return str(self.venv_path / _SCRIPTS_DIR_REL / "activate.bat")
         else:
-            return str(self.venv_path / "bin" / "python")
+            return f"source {self.venv_path}/bin/activate"
+    
+    @cached_property
+    def python_exe(self):
+        """Path to the Python executable in the virtual environment"""
+        return str(self.venv_path / _PY_EXE_REL)
     
     def install_dependencies(self):
         """Install project dependencies"""
-        print("\n📋 Installing project dependencies...")
-        
-        python_exe = self.get_python_executable()
+        import subprocess
         
-        # Upgrade pip first
-        print("⬆️  Upgrading pip...")
-        try:
-            subprocess.run([python_exe, "-m", "pip", "install", "--upgrade", "pip"], 
-                         check=True, capture_output=True, text=True)
-            print("✅ Pip upgraded successfully")
-        except subprocess.CalledProcessError as e:
-            print(f"⚠️  Warning: Failed to upgrade pip: {e}")
+        print("\n📋 Installing project dependencies...")
         
-        # Install requirements
         requirements_file = self.project_root / "requirements.txt"
         if not requirements_file.exists():
             print("❌ requirements.txt not found!")
             print("Creating requirements.txt with basic dependencies...")
             self.create_requirements_file()
         
+        # A bundled wheel directory lets the whole install run without network access
+        find_links = self.get_wheel_bundle()
+        offline = find_links is not None
+        
+        # Prefer uv, which resolves and downloads in parallel with a shared wheel cache
+        if self.install_with_uv(find_links):
+            return True
+        
+        # Upgrade pip first, unless it is already recent enough
+        pip_version = self.get_pip_version()
+        if pip_version and pip_version >= _PIP_MIN_VERSION:
+            print(f"✅ Pip {'.'.join(map(str, pip_version))} is up to date")
+        elif offline:
+            print("⚠️  Warning: Skipping pip upgrade, installing offline from bundled wheels")
+        else:
+            print("⬆️  Upgrading pip...")
+            try:
+                run_streamed([self.python_exe, "-m", "pip", "install", "--upgrade", "pip"], 
+                             env=self.installer_env)
+                print("✅ Pip upgraded successfully")
+            except subprocess.CalledProcessError as e:
+                print(f"⚠️  Warning: Failed to upgrade pip: {e}")
+        
+        if find_links is None:
+            find_links = self._parallel_pip_download(requirements_file)
+        
         print("📦 Installing dependencies from requirements.txt...")
+        install_command = [self.python_exe, "-m", "pip", "install", "-r", "requirements.txt"]
+        local_options = []
+        if find_links:
+            local_options.append("--no-index")
+            for wheel_dir in find_links:
+                local_options.extend(["--find-links", str(wheel_dir)])
+        
+        # The pinned requirements all ship wheels, so never spin up isolated
+        # build environments on the first attempt. A bundle install stays
+        # offline and wheel-only; downloaded wheels may not suit this
+        # interpreter, so for them the package index is the last resort.
+        attempts = [
+            ("binary wheels only", install_command + local_options + ["--only-binary=:all:", "--no-build-isolation"]),
+        ]
+        if not offline:
+            attempts.append(("source builds allowed", install_command + local_options))
+            if local_options:
+                attempts.append(("the package index", install_command))
+        
+        for attempt, (description, command) in enumerate(attempts):
+            if attempt:
+                print(f"   Retrying with {description}...")
+            try:
+                run_streamed(command, env=self.installer_env)
+                print("✅ Dependencies installed successfully")
+                return True
+            except subprocess.CalledProcessError as e:
+                if attempt + 1 < len(attempts):
+                    print(f"⚠️  Warning: Install with {description} failed: {e}")
+                else:
+                    print(f"❌ Failed to install dependencies: {e}")
+        return False
+    
+    def get_pip_version(self):
+        """Get the installed pip version as a tuple of ints, or None if unknown"""
+        import subprocess
+        
         try:
-            result = subprocess.run([python_exe, "-m", "pip", "install", "-r", "requirements.txt"], 
-                                  check=True, capture_output=True, text=True)
-            print("✅ Dependencies installed successfully")
-            return True
+            result = run_streamed([self.python_exe, "-m", "pip", "--version"], echo=False, 
+                                  env=self.installer_env)
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        # Output looks like "pip 24.0 from /path/to/pip (python 3.11)"
+        fields = result.stdout.split()
+        if len(fields) < 2 or fields[0] != "pip":
+            return None
+        version = []
+        for part in fields[1].split("."):
+            digits = re.match(r"\d+", part)
+            if digits is None:
+                break
+            version.append(int(digits.group()))
+        return tuple(version) or None
+    
+    def get_wheel_bundle(self):
+        """Get the bundled wheels directory if present and its checksums match"""
+        bundle_dir = self.project_root / "wheels"
+        if not bundle_dir.is_dir():
+            return None
+        if not verify_wheel_checksums(bundle_dir):
+            print(f"⚠️  Warning: Ignoring {bundle_dir}, contents do not match SHA256SUMS")
+            return None
+        print(f"📦 Using bundled wheels from {bundle_dir}")
+        return [bundle_dir]
+    
+    def get_uv_executable(self, bootstrap=True):
+        """Find uv on PATH, or bootstrap it into the virtual environment"""
+        import shutil
+        import subprocess
+        
+        uv_exe = shutil.which("uv")
+        if uv_exe:
+            return uv_exe
+        
+        scripts_dir = self.venv_path / _SCRIPTS_DIR_REL
+        uv_exe = shutil.which("uv", path=str(scripts_dir))
+        if uv_exe or not bootstrap:
+            return uv_exe
+        
+        print("⬇️  Bootstrapping uv...")
+        try:
+            run_streamed([self.python_exe, "-m", "pip", "install", "uv"], env=self.installer_env)
+        except subprocess.CalledProcessError as e:
+            print(f"⚠️  Warning: Failed to install uv: {e}")
+            return None
+        return shutil.which("uv", path=str(scripts_dir))
+    
+    def install_with_uv(self, find_links=None):
+        """Install requirements with uv, returning False if pip should be used instead"""
+        import subprocess
+        
+        # Bootstrapping uv needs the network, which a wheel bundle is meant to avoid
+        uv_exe = self.get_uv_executable(bootstrap=find_links is None)
+        if uv_exe is None:
+            return False
+        
+        print("📦 Installing dependencies from requirements.txt with uv...")
+        install_command = [uv_exe, "pip", "install", "--python", self.python_exe, "-r", "requirements.txt"]
+        if find_links:
+            install_command.append("--no-index")
+            for wheel_dir in find_links:
+                install_command.extend(["--find-links", str(wheel_dir)])
+        try:
+            run_streamed(install_command, env=self.installer_env)
+        except FileNotFoundError as e:
+            print(f"⚠️  Warning: Failed to run uv: {e}")
+            return False
         except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install dependencies: {e}")
-            print(f"Error output: {e.stderr}")
+            print(f"⚠️  Warning: uv failed to install dependencies: {e}")
+            print("   Falling back to pip")
             return False
+        print("✅ Dependencies installed successfully")
+        return True
+    
+    def read_requirements(self, requirements_file):
+        """Get the requirement specifiers listed in a requirements file"""
+        requirements = []
+        for line in requirements_file.read_text().splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                requirements.append(line)
+        return requirements
+    
+    def resolve_requirements(self, requirements_file):
+        """Resolve the full dependency set once, returning (name, version) pins
+        
+        Returns None if pip cannot produce a resolution report.
+        """
+        import json
+        import subprocess
+        import tempfile
+        
+        fd, report_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            run_streamed([self.python_exe, "-m", "pip", "install", "--dry-run", "--ignore-installed",
+                          "--quiet", "--only-binary=:all:", "--report", report_path,
+                          "-r", str(requirements_file)], env=self.installer_env)
+            with open(report_path) as f:
+                report = json.load(f)
+            return [(item["metadata"]["name"], item["metadata"]["version"])
+                    for item in report["install"]]
+        except (OSError, ValueError, KeyError, subprocess.CalledProcessError) as e:
+            print(f"⚠️  Warning: Failed to resolve requirements: {e}")
+            return None
+        finally:
+            os.unlink(report_path)
+    
+    def _parallel_pip_download(self, requirements_file):
+        """Download the resolved requirements concurrently so installation can run offline
+        
+        Dependencies are resolved once up front, so each download is a single
+        pinned wheel fetched with --no-deps. Returns the wheel directories to
+        install from, or None if resolving or any download failed and
+        installation should go to the package index instead.
+        """
+        import subprocess
+        import sysconfig
+        from concurrent.futures import ThreadPoolExecutor
+        
+        if not self.read_requirements(requirements_file):
+            return None
+        
+        print("🔎 Resolving dependencies...")
+        pins = self.resolve_requirements(requirements_file)
+        if not pins:
+            print("   Falling back to installing from the package index")
+            return None
+        
+        # Wheels are specific to the interpreter and platform they were fetched for
+        wheel_cache = get_cache_root() / "wheels" / f"{sys.implementation.cache_tag}-{sysconfig.get_platform()}"
+        
+        def download(name, version):
+            # Each pin gets its own directory so it can be checksummed and
+            # reused on its own
+            requirement = f"{name}=={version}"
+            wheel_dir = wheel_cache / re.sub(r"[^A-Za-z0-9._-]", "_", requirement.lower())
+            if verify_wheel_checksums(wheel_dir):
+                print(f"[{name}] Using cached wheel\n", end="", flush=True)
+                return wheel_dir
+            run_streamed([self.python_exe, "-m", "pip", "download", requirement, "--no-deps",
+                          "-d", str(wheel_dir), "--only-binary=:all:"], 
+                         prefix=f"[{name}] ", env=self.installer_env)
+            write_wheel_checksums(wheel_dir)
+            return wheel_dir
+        
+        print(f"⬇️  Downloading {len(pins)} packages in parallel...")
+        wheel_dirs = []
+        failures = []
+        with ThreadPoolExecutor(max_workers=min(8, len(pins))) as executor:
+            futures = {executor.submit(download, name, version): f"{name}=={version}"
+                       for name, version in pins}
+            for future, requirement in futures.items():
+                try:
+                    wheel_dirs.append(future.result())
+                except (OSError, subprocess.CalledProcessError) as e:
+                    failures.append((requirement, e))
+        
+        if failures:
+            for requirement, e in failures:
+                print(f"⚠️  Warning: Failed to download {requirement}: {e}")
+            print("   Falling back to installing from the package index")
+            return None
+        
+        print("✅ All packages downloaded")
+        return wheel_dirs
     
     def create_requirements_file(self):
         """Create requirements.txt if it doesn't exist"""
         requirements_content = """# Core deep learning and computer vision
 deepface==0.0.79
 opencv-python==4.8.1.78
+# DeepFace depends on the full tensorflow distribution and runs Keras models,
+# so a lighter runtime (tflite-runtime, onnxruntime) cannot replace it. Keep it
+# pinned; unpinned, DeepFace would pull in the latest TensorFlow release.
 tensorflow==2.13.0
 
 # GUI framework
@@ -143,18 +771,17 @@ psutil==5.9.5
 # flake8==6.0.0
 """
         
-        with open("requirements.txt", "w") as f:
-            f.write(requirements_content)
+        write_file_atomic(self.project_root / "requirements.txt", requirements_content)
         print("✅ Created requirements.txt")
     
-    def create_local_images_directory(self):
-        """Create local images directory for face database"""
-        print("\n📁 Setting up face database directory...")
+    def create_local_images_directory(self, report=print):
+        """Create local images directory for face database, passing progress messages to report"""
+        report("\n📁 Setting up face database directory...")
         
         images_dir = self.project_root / "local_images"
         if not images_dir.exists():
             images_dir.mkdir()
-            print(f"✅ Created directory: {images_dir}")
+            report(f"✅ Created directory: {images_dir}")
             
             # Create instructions file
             instructions = """HOW TO ADD PEOPLE TO RECOGNIZE:
@@ -173,36 +800,61 @@ Examples:
 
 After adding images, click 'Refresh Database' in the app.
 """
-            with open(images_dir / "INSTRUCTIONS.txt", "w") as f:
-                f.write(instructions)
-            print("✅ Created setup instructions")
+            write_file_atomic(images_dir / "INSTRUCTIONS.txt", instructions)
+            report("✅ Created setup instructions")
         else:
-            print(f"✅ Directory already exists: {images_dir}")
+            report(f"✅ Directory already exists: {images_dir}")
     
     def verify_installation(self):
         """Verify that the installation was successful"""
         print("\n🔍 Verifying installation...")
         
-        python_exe = self.get_python_executable()
-        
-        # Test key imports
+        # Test key packages. Most only need to be locatable, which avoids
+        # executing heavy modules like TensorFlow; binary wheels whose ABI
+        # matters are loaded through their cheapest compiled extension.
         test_imports = [
-            ("cv2", "OpenCV"),
-            ("deepface", "DeepFace"),
-            ("tensorflow", "TensorFlow"),
-            ("matplotlib", "Matplotlib"),
-            ("PIL", "Pillow"),
-            ("numpy", "NumPy")
+            ("cv2", "OpenCV", "cv2"),
+            ("deepface", "DeepFace", None),
+            ("tensorflow", "TensorFlow", None),
+            ("matplotlib", "Matplotlib", None),
+            ("PIL", "Pillow", None),
+            ("numpy", "NumPy", "numpy.core._multiarray_umath")
         ]
         
+        # Check every module in one interpreter so startup is only paid once
+        verify_script = (
+            "import importlib, importlib.util, sys\n"
+            "for probe in sys.argv[1:]:\n"
+            "    kind, _, name = probe.partition(':')\n"
+            "    try:\n"
+            "        if kind == 'import':\n"
+            "            importlib.import_module(name)\n"
+            "        elif importlib.util.find_spec(name) is None:\n"
+            "            raise ImportError('not found')\n"
+            "        print('OK', probe, flush=True)\n"
+            "    except Exception as e:\n"
+            "        print('FAIL', probe, e, flush=True)\n"
+        )
+        probes = {}
+        for import_name, display_name, load_module in test_imports:
+            if load_module:
+                probes[import_name] = f"import:{load_module}"
+            else:
+                probes[import_name] = f"spec:{import_name}"
+        result = run_streamed([self.python_exe, "-c", verify_script] + list(probes.values()), 
+                              check=False, echo=False)
+        succeeded = set()
+        for line in result.stdout.splitlines():
+            fields = line.split(" ", 2)
+            if len(fields) >= 2 and fields[0] == "OK":
+                succeeded.add(fields[1])
+        
         all_good = True
-        for import_name, display_name in test_imports:
-            try:
-                result = subprocess.run([python_exe, "-c", f"import {import_name}"], 
-                                      check=True, capture_output=True, text=True)
-                print(f"✅ {display_name} import successful")
-            except subprocess.CalledProcessError:
-                print(f"❌ {display_name} import failed")
+        for import_name, display_name, _ in test_imports:
+            if probes[import_name] in succeeded:
+                print(f"✅ {display_name} is installed")
+            else:
+                print(f"❌ {display_name} is missing or failed to load")
                 all_good = False
         
         return all_good
@@ -214,10 +866,14 @@ After adding images, click 'Refresh Database' in the app.
         print("=" * 60)
         print("\n📋 NEXT STEPS:")
         print("1. Activate your virtual environment:")
-        if self.is_windows:
-            print(f"   {self.venv_name}\\Scripts\\activate")
+        try:
+            venv_display = self.venv_path.relative_to(self.project_root)
+        except ValueError:
+            venv_display = self.venv_path
+        if _IS_WINDOWS:
+            print(f"   {venv_display}\\Scripts\\activate")
         else:
-            print(f"   source {self.venv_name}/bin/activate")
+            print(f"   source {venv_display}/bin/activate")
         
         print("\n2. Add face images to the local_images folder:")
         print("   - Use clear, well-lit photos")
@@ -245,6 +901,8 @@ After adding images, click 'Refresh Database' in the app.
     
     def run_setup(self):
         """Run the complete setup process"""
+        from concurrent.futures import ThreadPoolExecutor
+        
         self.print_header()
         
         # Check Python version
@@ -255,27 +913,56 @@ After adding images, click 'Refresh Database' in the app.
             print("❌ Setup failed at virtual environment creation")
             sys.exit(1)
         
-        # Install dependencies
-        if not self.install_dependencies():
+        # Create directories in the background while dependencies install;
+        # their messages are held back so they don't interleave with pip's log
+        directory_messages = []
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            directories = executor.submit(self.create_local_images_directory, directory_messages.append)
+            # A restored cache already has the dependencies
+            dependencies_ok = self.restored_from_cache or self.install_dependencies()
+            directories.result()
+        for message in directory_messages:
+            print(message)
+        
+        if not dependencies_ok:
             print("❌ Setup failed at dependency installation")
             sys.exit(1)
         
-        # Create directories
-        self.create_local_images_directory()
-        
         # Verify installation
         if not self.verify_installation():
             print("⚠️  Setup completed with some issues")
             print("   Some dependencies may not have installed correctly")
             print("   Check the error messages above")
+            if self.restored_from_cache:
+                self.discard_cached_environment()
+        elif self.created_venv:
+            # Only cache environments built from scratch by this run, never a
+            # reused venv that may carry extra packages or a broken install
+            self.save_environment_to_cache()
         
         # Print usage instructions
         self.print_usage_instructions()
 
+def parse_args(argv=None):
+    """Parse command line options"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Set up the virtual environment for the Emotion Recognition System")
+    existing = parser.add_mutually_exclusive_group()
+    existing.add_argument("--recreate", "-y", "--yes", dest="recreate", action="store_true",
+                          help="delete and rebuild the virtual environment, ignoring any cached copy")
+    existing.add_argument("--reuse", dest="recreate", action="store_false",
+                          help="keep an existing virtual environment (default)")
+    parser.add_argument("--venv-path", type=Path, default=None,
+                        help="location of the virtual environment (default: ./emotion_env)")
+    return parser.parse_args(argv)
+
 def main():
     """Main setup function"""
+    args = parse_args()
     try:
-        setup = EmotionRecognitionSetup()
+        setup = EmotionRecognitionSetup(venv_path=args.venv_path, recreate=args.recreate)
         setup.run_setup()
     except KeyboardInterrupt:
         print("\n\n⚠️  Setup interrupted by user")